@@ -1,19 +1,25 @@
 # backend/main.py
 
 import os
-import time
 import re
-import shutil
-import random
+import asyncio
 import warnings
+from contextlib import asynccontextmanager
+from io import StringIO
 from typing import List, Optional
 
+from cachetools import TTLCache
+
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException
-from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware  # Import CORS middleware
 from dotenv import load_dotenv
-import requests
-from urllib.parse import urlencode
+import httpx
+import numpy as np
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; the numpy scan is used without it
+    njit = None
+from Bio import BiopythonWarning
 from Bio.PDB import PDBParser
 from Bio.Blast import NCBIWWW, NCBIXML
 from Bio.SeqUtils.ProtParam import ProteinAnalysis
@@ -21,7 +27,34 @@ from Bio.SeqUtils.ProtParam import ProteinAnalysis
 # Load environment variables from .env file
 load_dotenv()
 
-app = FastAPI()
+# Install the Biopython warning filter once at import; mutating the filter
+# list per request is not free and not safe under concurrency
+warnings.filterwarnings("ignore", category=BiopythonWarning)
+
+# =======================
+# Application Lifespan
+# =======================
+
+# Shared async client for all NCBI requests. Keeping connections alive across
+# polls avoids a fresh TLS handshake per request, and HTTP/2 multiplexes all
+# concurrent polls over one connection to the BLAST origin.
+http_client: Optional[httpx.AsyncClient] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global http_client
+    http_client = httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(30.0, connect=5.0),
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+    )
+    # Trigger JIT compilation before the first request hits /orf/find
+    if _scan_orfs is not None:
+        _scan_orfs(np.frombuffer(b"ATGAAATAA", dtype=np.uint8))
+    yield
+    await http_client.aclose()
+
+app = FastAPI(lifespan=lifespan)
 
 # =======================
 # CORS Configuration
@@ -49,16 +82,57 @@ app.add_middleware(
 
 PORT = int(os.getenv('PORT', 8000))
 BLAST_URL = os.getenv('BLAST_URL', 'https://blast.ncbi.nlm.nih.gov/blast/Blast.cgi')
-POLL_INTERVAL_MS = int(os.getenv('POLL_INTERVAL_MS', 5000))  # in milliseconds
-UPLOAD_DIR = 'uploads/'
-
-# Ensure the upload directory exists
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# NCBI-recommended polling schedule: first check after 20 s, then every 60 s
+INITIAL_POLL_S = int(os.getenv('INITIAL_POLL_S', 20))
+POLL_INTERVAL_S = int(os.getenv('POLL_INTERVAL_S', 60))
+
+# Compiled once at import; status markers are plain substrings and are
+# matched with 'in' instead of per-call re.search
+RID_RE = re.compile(r"RID\s+=\s+(\S+)")
+RTOE_RE = re.compile(r"RTOE\s+=\s+(\d+)")
+RESULT_RID_RE = re.compile(r"^\s+RID\s+=\s+", re.MULTILINE)
+
+STATUS_MESSAGES = {
+    "WAITING": "BLAST search is in progress.",
+    "FAILED": "BLAST search failed. Please report to blast-help@ncbi.nlm.nih.gov.",
+    "UNKNOWN": "BLAST search expired or RID is invalid.",
+}
+
+# Completed result text for a RID is idempotent, so it can be cached for a
+# long time; status flips often and only gets a few seconds. The per-RID
+# locks coalesce concurrent requesters into a single upstream fetch and
+# live in a bounded TTL cache so probing random RIDs can't grow the map
+# without limit.
+_result_cache = TTLCache(maxsize=1024, ttl=3600)
+_status_cache = TTLCache(maxsize=4096, ttl=5)
+_rid_locks = TTLCache(maxsize=4096, ttl=3600)
+
+def _rid_lock(rid: str) -> asyncio.Lock:
+    lock = _rid_locks.get(rid)
+    if lock is None:
+        lock = _rid_locks[rid] = asyncio.Lock()
+    return lock
+
+# One parser for all requests; QUIET skips per-atom warning construction
+PDB_PARSER = PDBParser(QUIET=True)
+
+# Cap concurrent qblast jobs to stay within NCBI's usage policy
+BLAST_SEMAPHORE = asyncio.Semaphore(4)
 
 # =======================
 # Utility Functions
 # =======================
 
+def extract_blast_status(content: str) -> Optional[str]:
+    """
+    Extract the Status= token from a BLAST response in one scan.
+    """
+    idx = content.find("Status=")
+    if idx < 0:
+        return None
+    token = content[idx + 7:idx + 14].split()
+    return token[0] if token else None
+
 def adjust_program_param(program: str) -> str:
     """
     Adjust the program parameter based on specific cases.
@@ -69,50 +143,122 @@ def adjust_program_param(program: str) -> str:
         return 'blastp&SERVICE=rpsblast'
     return program
 
-def encode_queries(files: List[UploadFile]) -> str:
+async def read_queries(files: List[UploadFile]) -> str:
     """
-    Read and URL-encode the contents of the uploaded query files.
+    Read and concatenate the contents of the uploaded query files.
     """
-    encoded_query = ''
+    # Read each upload straight from its spooled buffer; the raw FASTA is
+    # sent as a form field, so no URL-encoding pass is needed here.
+    parts = []
     for file in files:
-        file_location = os.path.join(UPLOAD_DIR, file.filename)
-        with open(file_location, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        with open(file_location, "r", encoding='utf-8') as f:
-            data = f.read()
-            encoded_query += requests.utils.quote(data)
-        os.remove(file_location)  # Delete the file after reading
-    return encoded_query
+        data = await file.read()
+        parts.append(data.decode('utf-8'))
+    return ''.join(parts)
+
+def split_fasta_records(fasta_text: str) -> List[str]:
+    """
+    Split FASTA text into individual records.
+
+    A headerless bare sequence (accepted by NCBI's QUERY parameter) is
+    kept intact as a single record.
+    """
+    records = []
+    for i, part in enumerate(fasta_text.split('\n>')):
+        part = part.strip()
+        if not part:
+            continue
+        if i > 0:
+            # Parts after the first lost their '>' to the split delimiter
+            part = '>' + part
+        records.append(part + '\n')
+    return records
+
+AMINO_ACIDS = np.frombuffer(b"ACDEFGHIKLMNPQRSTVWY", dtype=np.uint8)  # Standard amino acids
+_rng = np.random.default_rng()
 
 def generate_random_sequence(length: int) -> str:
     """
     Generate a random protein sequence of given length.
     """
-    amino_acids = "ACDEFGHIKLMNPQRSTVWY"  # Standard amino acids
-    return ''.join(random.choice(amino_acids) for _ in range(length))
+    # One vectorized draw plus a table lookup instead of a Python-level
+    # random.choice call per residue
+    indices = _rng.integers(0, len(AMINO_ACIDS), size=length, dtype=np.uint8)
+    return AMINO_ACIDS[indices].tobytes().decode('ascii')
+
+if njit is not None:
+    @njit(cache=True, boundscheck=False)
+    def _scan_orfs(seq):
+        """
+        Native single-pass ORF scan over a uint8 sequence array.
+
+        Returns a flat list of alternating (start, end) indices, one pair
+        per ORF.
+        """
+        spans = [0 for _ in range(0)]
+        for frame in range(3):
+            open_starts = [0 for _ in range(0)]
+            j = frame
+            while j + 2 < seq.shape[0]:
+                c0 = seq[j]
+                c1 = seq[j + 1]
+                c2 = seq[j + 2]
+                if c0 == 65 and c1 == 84 and c2 == 71:                  # ATG
+                    open_starts.append(j)
+                elif len(open_starts) > 0 and c0 == 84 and (
+                        (c1 == 65 and (c2 == 65 or c2 == 71))           # TAA/TAG
+                        or (c1 == 71 and c2 == 65)):                    # TGA
+                    for start in open_starts:
+                        spans.append(start)
+                        spans.append(j + 3)
+                    open_starts = [0 for _ in range(0)]
+                j += 3
+        return spans
+else:
+    _scan_orfs = None
 
 def find_orfs(dna_sequence: str) -> List[str]:
     """
     Find all ORFs in a DNA sequence.
     """
-    start_codon = "ATG"
-    stop_codons = {"TAA", "TAG", "TGA"}
-    orfs = []
-    dna_length = len(dna_sequence)
-
-    # Loop through all possible start positions
-    for i in range(dna_length - 2):
-        codon = dna_sequence[i:i+3]
-        # Check for start codon
-        if codon == start_codon:
-            # Search for stop codon from the position of the start codon
-            for j in range(i + 3, dna_length - 2, 3):
-                codon = dna_sequence[j:j+3]
-                # If stop codon is found, save the ORF and break out of the inner loop
-                if codon in stop_codons:
-                    orfs.append(dna_sequence[i:j+3])
-                    break
-    return orfs
+    seq = dna_sequence.encode('ascii')
+    found = []
+
+    # Single left-to-right pass per reading frame: remember every open start
+    # codon and emit all of them when the next in-frame stop codon appears.
+    # Same ORFs as scanning forward from each ATG, but O(n) instead of O(n^2).
+    if _scan_orfs is not None:
+        # Jitted scan: the whole state machine runs as native code
+        spans = _scan_orfs(np.frombuffer(seq, dtype=np.uint8))
+        found = [(spans[i], dna_sequence[spans[i]:spans[i + 1]])
+                 for i in range(0, len(spans), 2)]
+        found.sort(key=lambda item: item[0])
+        return [orf for _, orf in found]
+
+    # Numpy fallback: codon classification is vectorized so only the
+    # start/stop state machine runs in Python.
+    for frame in range(3):
+        num_codons = (len(seq) - frame) // 3
+        if num_codons <= 0:
+            continue
+        codons = np.frombuffer(seq, dtype=np.uint8, count=3 * num_codons,
+                               offset=frame).reshape(-1, 3)
+        is_start = (codons == (65, 84, 71)).all(1)            # ATG
+        is_stop = ((codons == (84, 65, 65)).all(1)            # TAA
+                   | (codons == (84, 65, 71)).all(1)          # TAG
+                   | (codons == (84, 71, 65)).all(1))         # TGA
+        open_starts = []
+        for k in np.flatnonzero(is_start | is_stop):
+            j = frame + 3 * int(k)
+            if is_start[k]:
+                open_starts.append(j)
+            elif open_starts:
+                for start in open_starts:
+                    found.append((start, dna_sequence[start:j+3]))
+                open_starts.clear()
+
+    # Preserve the original ordering by start position across frames
+    found.sort(key=lambda item: item[0])
+    return [orf for _, orf in found]
 
 def analyze_protein_sequence(protein_sequence: str) -> dict:
     """
@@ -150,33 +296,30 @@ async def submit_blast_job(
     program_param = adjust_program_param(program)
 
     try:
-        encoded_query = encode_queries(queries)
+        fasta_text = await read_queries(queries)
     except Exception as e:
         print(f"Error reading query files: {e}")
         raise HTTPException(status_code=500, detail="Failed to read query files.")
 
-    # Build the request parameters
+    # Build the request parameters; the client form-encodes QUERY once,
+    # so the FASTA is not URL-encoded twice on the wire
     params = {
         'CMD': 'Put',
         'PROGRAM': program_param,
         'DATABASE': database,
-        'QUERY': encoded_query
+        'QUERY': fasta_text
     }
 
     try:
-        response = requests.post(
-            BLAST_URL,
-            data=urlencode(params),
-            headers={'Content-Type': 'application/x-www-form-urlencoded'}
-        )
+        response = await http_client.post(BLAST_URL, data=params)
         response.raise_for_status()
     except Exception as e:
         print(f"Error submitting BLAST request: {e}")
         raise HTTPException(status_code=500, detail="Failed to submit BLAST request.")
 
     # Extract RID and RTOE using regex
-    rid_match = re.search(r"RID\s+=\s+(\S+)", response.text)
-    rtoe_match = re.search(r"RTOE\s+=\s+(\d+)", response.text)
+    rid_match = RID_RE.search(response.text)
+    rtoe_match = RTOE_RE.search(response.text)
 
     if rid_match and rtoe_match:
         rid = rid_match.group(1)
@@ -200,28 +343,34 @@ async def check_blast_status(rid: str):
         'RID': rid
     }
 
-    try:
-        response = requests.get(BLAST_URL, params=params)
-        response.raise_for_status()
-        content = response.text
-
-        if re.search(r"Status=WAITING", content):
-            return {"status": "WAITING", "message": "BLAST search is in progress."}
-        elif re.search(r"Status=FAILED", content):
-            return {"status": "FAILED", "message": "BLAST search failed. Please report to blast-help@ncbi.nlm.nih.gov."}
-        elif re.search(r"Status=UNKNOWN", content):
-            return {"status": "UNKNOWN", "message": "BLAST search expired or RID is invalid."}
-        elif re.search(r"Status=READY", content):
-            if re.search(r"ThereAreHits=yes", content):
-                return {"status": "READY", "message": "BLAST search completed with hits."}
+    async with _rid_lock(rid):
+        if rid in _status_cache:
+            return _status_cache[rid]
+
+        try:
+            response = await http_client.get(BLAST_URL, params=params)
+            response.raise_for_status()
+            content = response.text
+
+            status_token = extract_blast_status(content)
+            if status_token in STATUS_MESSAGES:
+                status = {"status": status_token, "message": STATUS_MESSAGES[status_token]}
+            elif status_token == "READY":
+                if "ThereAreHits=yes" in content:
+                    status = {"status": "READY", "message": "BLAST search completed with hits."}
+                else:
+                    status = {"status": "READY", "message": "BLAST search completed with no hits."}
             else:
-                return {"status": "READY", "message": "BLAST search completed with no hits."}
-        else:
-            print("Unexpected status in BLAST response.")
-            raise HTTPException(status_code=500, detail="Unexpected response from BLAST server.")
-    except Exception as e:
-        print(f"Error checking BLAST status: {e}")
-        raise HTTPException(status_code=500, detail="Failed to check BLAST job status.")
+                print("Unexpected status in BLAST response.")
+                raise HTTPException(status_code=500, detail="Unexpected response from BLAST server.")
+
+            _status_cache[rid] = status
+            return status
+        except HTTPException as he:
+            raise he
+        except Exception as e:
+            print(f"Error checking BLAST status: {e}")
+            raise HTTPException(status_code=500, detail="Failed to check BLAST job status.")
 
 @app.get("/blast/result/{rid}")
 async def get_blast_result(rid: str):
@@ -237,97 +386,82 @@ async def get_blast_result(rid: str):
         'RID': rid
     }
 
-    try:
-        response = requests.get(BLAST_URL, params=params)
-        response.raise_for_status()
-        content = response.text
-
-        if re.match(r"^\s+RID\s+=\s+", content, re.MULTILINE):
-            return {"result": content}
-        elif re.search(r"Status=WAITING", content):
-            raise HTTPException(
-                status_code=400,
-                detail="Results are not ready yet. Please check the job status."
-            )
-        elif re.search(r"Status=FAILED", content):
-            raise HTTPException(
-                status_code=400,
-                detail="BLAST search failed. Please report to blast-help@ncbi.nlm.nih.gov."
-            )
-        elif re.search(r"Status=UNKNOWN", content):
-            raise HTTPException(
-                status_code=400,
-                detail="BLAST search expired or RID is invalid."
-            )
-        else:
-            print("Unexpected content in BLAST result response.")
-            raise HTTPException(status_code=500, detail="Unexpected response from BLAST server.")
-    except HTTPException as he:
-        raise he
-    except Exception as e:
-        print(f"Error retrieving BLAST results: {e}")
-        raise HTTPException(status_code=500, detail="Failed to retrieve BLAST results.")
+    async with _rid_lock(rid):
+        if rid in _result_cache:
+            return _result_cache[rid]
 
-@app.post("/blast/poll-and-retrieve")
-async def poll_and_retrieve_blast(
-    program: str = Form(...),
-    database: str = Form(...),
-    queries: List[UploadFile] = File(...)
-):
+        try:
+            response = await http_client.get(BLAST_URL, params=params)
+            response.raise_for_status()
+            content = response.text
+
+            if RESULT_RID_RE.match(content):
+                result = {"result": content}
+                _result_cache[rid] = result
+                return result
+            status_token = extract_blast_status(content)
+            if status_token == "WAITING":
+                raise HTTPException(
+                    status_code=400,
+                    detail="Results are not ready yet. Please check the job status."
+                )
+            elif status_token == "FAILED":
+                raise HTTPException(
+                    status_code=400,
+                    detail="BLAST search failed. Please report to blast-help@ncbi.nlm.nih.gov."
+                )
+            elif status_token == "UNKNOWN":
+                raise HTTPException(
+                    status_code=400,
+                    detail="BLAST search expired or RID is invalid."
+                )
+            else:
+                print("Unexpected content in BLAST result response.")
+                raise HTTPException(status_code=500, detail="Unexpected response from BLAST server.")
+        except HTTPException as he:
+            raise he
+        except Exception as e:
+            print(f"Error retrieving BLAST results: {e}")
+            raise HTTPException(status_code=500, detail="Failed to retrieve BLAST results.")
+
+async def submit_blast_chunk(program_param: str, database: str, fasta_chunk: str) -> tuple:
     """
-    Submit a BLAST job, wait for completion, and retrieve results.
+    Submit one FASTA chunk to NCBI and return its (RID, RTOE).
     """
-    if not program or not database or not queries:
-        raise HTTPException(
-            status_code=400,
-            detail="Missing required fields: program, database, and at least one query file."
-        )
-
-    program_param = adjust_program_param(program)
-
-    try:
-        encoded_query = encode_queries(queries)
-    except Exception as e:
-        print(f"Error reading query files: {e}")
-        raise HTTPException(status_code=500, detail="Failed to read query files.")
-
-    # Build the request parameters for submission
     params = {
         'CMD': 'Put',
         'PROGRAM': program_param,
         'DATABASE': database,
-        'QUERY': encoded_query
+        'QUERY': fasta_chunk
     }
 
     try:
-        submit_response = requests.post(
-            BLAST_URL,
-            data=urlencode(params),
-            headers={'Content-Type': 'application/x-www-form-urlencoded'}
-        )
+        submit_response = await http_client.post(BLAST_URL, data=params)
         submit_response.raise_for_status()
     except Exception as e:
         print(f"Error submitting BLAST request: {e}")
         raise HTTPException(status_code=500, detail="Failed to submit BLAST request.")
 
     # Extract RID and RTOE
-    rid_match = re.search(r"RID\s+=\s+(\S+)", submit_response.text)
-    rtoe_match = re.search(r"RTOE\s+=\s+(\d+)", submit_response.text)
+    rid_match = RID_RE.search(submit_response.text)
+    rtoe_match = RTOE_RE.search(submit_response.text)
 
     if rid_match and rtoe_match:
-        rid = rid_match.group(1)
-        rtoe = int(rtoe_match.group(1))
-    else:
-        print("Failed to retrieve RID and RTOE from the response.")
-        raise HTTPException(status_code=500, detail="Failed to retrieve job ID.")
+        return rid_match.group(1), int(rtoe_match.group(1))
 
-    # Wait for the estimated time to completion
-    time.sleep(rtoe)
+    print("Failed to retrieve RID and RTOE from the response.")
+    raise HTTPException(status_code=500, detail="Failed to retrieve job ID.")
+
+async def poll_blast_chunk(rid: str, rtoe: int) -> Optional[str]:
+    """
+    Poll one RID until completion and return its result text, or None if
+    the search finished with no hits.
+    """
+    # Wait for the estimated time to completion before the first check
+    await asyncio.sleep(max(rtoe, INITIAL_POLL_S))
 
     # Poll for results
     while True:
-        time.sleep(POLL_INTERVAL_MS / 1000)  # Convert ms to seconds
-
         status_params = {
             'CMD': 'Get',
             'FORMAT_OBJECT': 'SearchInfo',
@@ -335,27 +469,30 @@ async def poll_and_retrieve_blast(
         }
 
         try:
-            status_response = requests.get(BLAST_URL, params=status_params)
+            status_response = await http_client.get(BLAST_URL, params=status_params)
             status_response.raise_for_status()
             content = status_response.text
 
-            if re.search(r"Status=WAITING", content):
+            status_token = extract_blast_status(content)
+
+            if status_token == "WAITING":
+                await asyncio.sleep(POLL_INTERVAL_S)
                 continue  # Still searching
 
-            if re.search(r"Status=FAILED", content):
+            if status_token == "FAILED":
                 raise HTTPException(
                     status_code=500,
                     detail=f"Search {rid} failed; please report to blast-help@ncbi.nlm.nih.gov."
                 )
 
-            if re.search(r"Status=UNKNOWN", content):
+            if status_token == "UNKNOWN":
                 raise HTTPException(
                     status_code=400,
                     detail="Search expired or RID is invalid."
                 )
 
-            if re.search(r"Status=READY", content):
-                if re.search(r"ThereAreHits=yes", content):
+            if status_token == "READY":
+                if "ThereAreHits=yes" in content:
                     # Retrieve results
                     result_params = {
                         'CMD': 'Get',
@@ -364,15 +501,14 @@ async def poll_and_retrieve_blast(
                     }
 
                     try:
-                        result_response = requests.get(BLAST_URL, params=result_params)
+                        result_response = await http_client.get(BLAST_URL, params=result_params)
                         result_response.raise_for_status()
-                        result_content = result_response.text
-                        return {"result": result_content}
+                        return result_response.text
                     except Exception as e:
                         print(f"Error retrieving BLAST results: {e}")
                         raise HTTPException(status_code=500, detail="Failed to retrieve BLAST results.")
                 else:
-                    return {"message": "No hits found."}
+                    return None  # No hits for this chunk
 
             # Unexpected status
             print("Unexpected status while polling for results.")
@@ -384,6 +520,68 @@ async def poll_and_retrieve_blast(
             print(f"Error polling for BLAST results: {e}")
             raise HTTPException(status_code=500, detail="Failed to poll for BLAST results.")
 
+@app.post("/blast/poll-and-retrieve")
+async def poll_and_retrieve_blast(
+    program: str = Form(...),
+    database: str = Form(...),
+    queries: List[UploadFile] = File(...),
+    chunksize: int = Form(50)
+):
+    """
+    Submit a BLAST job, wait for completion, and retrieve results.
+
+    Multi-sequence inputs are split into chunks of `chunksize` FASTA
+    records submitted as independent RIDs and polled in parallel, so
+    NCBI schedules them concurrently instead of serializing one big job.
+    """
+    if not program or not database or not queries:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing required fields: program, database, and at least one query file."
+        )
+
+    program_param = adjust_program_param(program)
+
+    try:
+        fasta_text = await read_queries(queries)
+    except Exception as e:
+        print(f"Error reading query files: {e}")
+        raise HTTPException(status_code=500, detail="Failed to read query files.")
+
+    records = split_fasta_records(fasta_text)
+    if not records:
+        raise HTTPException(status_code=400, detail="No FASTA records found in query files.")
+    chunksize = max(chunksize, 1)
+    chunks = [
+        ''.join(records[i:i + chunksize])
+        for i in range(0, len(records), chunksize)
+    ]
+
+    # Submit all chunks concurrently, then poll every RID in parallel.
+    # TaskGroup cancels the sibling tasks when one chunk fails, so a 500
+    # on one RID doesn't leave the others polling NCBI with no consumer.
+    try:
+        async with asyncio.TaskGroup() as tg:
+            submit_tasks = [
+                tg.create_task(submit_blast_chunk(program_param, database, chunk))
+                for chunk in chunks
+            ]
+        submissions = [task.result() for task in submit_tasks]
+        async with asyncio.TaskGroup() as tg:
+            poll_tasks = [
+                tg.create_task(poll_blast_chunk(rid, rtoe))
+                for rid, rtoe in submissions
+            ]
+        results = [task.result() for task in poll_tasks]
+    except* HTTPException as eg:
+        raise eg.exceptions[0]
+
+    # Merge chunk results in submission order
+    hits = [result for result in results if result is not None]
+    if not hits:
+        return {"message": "No hits found."}
+    return {"result": "\n".join(hits)}
+
 # =======================
 # Protein Generation and Analysis Endpoints
 # =======================
@@ -391,17 +589,18 @@ async def poll_and_retrieve_blast(
 @app.post("/protein/generate")
 async def generate_protein_sequence(length: int = Form(...)):
     """
-    Generate a random protein sequence and save it to a FASTA file.
+    Generate a random protein sequence and return it in FASTA form.
     """
     try:
         protein_sequence = generate_random_sequence(length)
         fasta_content = f">Random_Protein\n{protein_sequence}\n"
-        fasta_filename = "protein_sequence.fasta"
-        with open(fasta_filename, "w") as f:
-            f.write(fasta_content)
+        # Return the FASTA in the response body instead of writing a shared
+        # protein_sequence.fasta, which raced under concurrent requests and
+        # blocked the event loop on disk I/O
         return {
-            "message": "Protein sequence generated and saved to protein_sequence.fasta.",
-            "protein_sequence": protein_sequence
+            "message": "Protein sequence generated.",
+            "protein_sequence": protein_sequence,
+            "fasta": fasta_content
         }
     except Exception as e:
         print(f"Error generating protein sequence: {e}")
@@ -420,15 +619,9 @@ async def mock_structure_prediction():
     ATOM      5  CB  MET A   1      21.012  36.421  26.633  1.00 20.00           C  
     """
 
-    pdb_filename = "mock_protein_model.pdb"
     try:
-        with open(pdb_filename, "w") as f:
-            f.write(mock_pdb_content)
-        print("Mock PDB model saved to mock_protein_model.pdb.")
-
-        # Analyze the structure
-        parser = PDBParser()
-        structure = parser.get_structure('Mock_Protein', pdb_filename)
+        # Analyze the structure directly from memory; no PDB file on disk
+        structure = PDB_PARSER.get_structure('Mock_Protein', StringIO(mock_pdb_content))
         analysis = []
         for model in structure:
             for chain in model:
@@ -461,40 +654,39 @@ async def run_nr_blast(
     """
     try:
         print("Running NR BLAST search...")
-        result_handle = NCBIWWW.qblast("blastp", "nr", protein_sequence)
+        # qblast and the XML parse both block; run them on a worker thread
+        # so the event loop stays responsive
+        async with BLAST_SEMAPHORE:
+            result_handle = await asyncio.to_thread(
+                NCBIWWW.qblast, "blastp", "nr", protein_sequence
+            )
         print("NR BLAST search completed.")
 
-        # Save the results to an XML file
-        xml_filename = "blast_results_nr.xml"
-        with open(xml_filename, "w") as out_file:
-            out_file.write(result_handle.read())
+        # Parse the BLAST results straight from the handle; no write/reread
+        # round-trip through an XML file on disk
+        blast_record = await asyncio.to_thread(NCBIXML.read, result_handle)
         result_handle.close()
-        print(f"NR BLAST results saved to {xml_filename}.")
-
-        # Parse the BLAST results
-        with open(xml_filename) as result_handle:
-            blast_record = NCBIXML.read(result_handle)
 
         # Extract top 5 hits
-        top_hits = []
-        for alignment in blast_record.alignments[:5]:
-            hit_info = {
+        top_hits = [
+            {
                 "title": alignment.title,
                 "length": alignment.length,
-                "hsps": []
-            }
-            for hsp in alignment.hsps:
-                hsp_info = {
-                    "e_value": hsp.expect,
-                    "identities": hsp.identities,
-                    "alignment": {
-                        "query": hsp.query,
-                        "match": hsp.match,
-                        "subject": hsp.sbjct
+                "hsps": [
+                    {
+                        "e_value": hsp.expect,
+                        "identities": hsp.identities,
+                        "alignment": {
+                            "query": hsp.query,
+                            "match": hsp.match,
+                            "subject": hsp.sbjct
+                        }
                     }
-                }
-                hit_info["hsps"].append(hsp_info)
-            top_hits.append(hit_info)
+                    for hsp in alignment.hsps
+                ]
+            }
+            for alignment in blast_record.alignments[:5]
+        ]
 
         return {
             "message": "NR BLAST search completed.",
@@ -512,33 +704,27 @@ async def run_pdb_blast(
     Run BLASTP against the PDB database.
     """
     try:
-        warnings.simplefilter('ignore')  # Ignore Biopython warnings
         print("Running PDB BLAST search...")
-        result_handle = NCBIWWW.qblast("blastp", "pdb", protein_sequence)
+        # qblast and the XML parse both block; run them on a worker thread
+        # so the event loop stays responsive
+        async with BLAST_SEMAPHORE:
+            result_handle = await asyncio.to_thread(
+                NCBIWWW.qblast, "blastp", "pdb", protein_sequence
+            )
         print("PDB BLAST search completed.")
 
-        # Save the results to an XML file
-        xml_filename = "blast_results_pdb.xml"
-        with open(xml_filename, "w") as out_file:
-            out_file.write(result_handle.read())
-        result_handle.close()
-        print(f"PDB BLAST results saved to {xml_filename}.")
-
-        # Parse the BLAST results
-        with open(xml_filename) as result_handle:
-            blast_records = NCBIXML.parse(result_handle)
-            blast_records = list(blast_records)  # Convert generator to list
+        # Stream-parse the results straight from the handle; no write/reread
+        # round-trip through an XML file on disk
+        blast_records = await asyncio.to_thread(
+            lambda: list(NCBIXML.parse(result_handle))
+        )
 
         # Extract relevant information
-        results = []
-        for blast_record in blast_records:
-            record_info = {
+        results = [
+            {
                 "query": blast_record.query,
-                "alignments": []
-            }
-            for alignment in blast_record.alignments:
-                for hsp in alignment.hsps:
-                    alignment_info = {
+                "alignments": [
+                    {
                         "match": alignment.title,
                         "score": hsp.score,
                         "e_value": hsp.expect,
@@ -552,8 +738,13 @@ async def run_pdb_blast(
                         "gaps": hsp.gaps,
                         "alignment_length": hsp.align_length
                     }
-                    record_info["alignments"].append(alignment_info)
-            results.append(record_info)
+                    for alignment in blast_record.alignments
+                    for hsp in alignment.hsps
+                ]
+            }
+            for blast_record in blast_records
+        ]
+        result_handle.close()
 
         return {
             "message": "PDB BLAST search completed.",
@@ -571,33 +762,27 @@ async def run_swissprot_blast(
     Run BLASTP against the SwissProt database.
     """
     try:
-        warnings.simplefilter('ignore', category=BiopythonWarning)
         print("Starting SwissProt BLAST search...")
-        result_handle = NCBIWWW.qblast("blastp", "swissprot", protein_sequence, expect=1e-3)
+        # qblast and the XML parse both block; run them on a worker thread
+        # so the event loop stays responsive
+        async with BLAST_SEMAPHORE:
+            result_handle = await asyncio.to_thread(
+                NCBIWWW.qblast, "blastp", "swissprot", protein_sequence, expect=1e-3
+            )
         print("SwissProt BLAST search completed.")
 
-        # Save the results to an XML file
-        xml_filename = "blast_result_swissprot.xml"
-        with open(xml_filename, "w") as out_handle:
-            out_handle.write(result_handle.read())
-        result_handle.close()
-        print(f"SwissProt BLAST results saved to {xml_filename}.")
-
-        # Parse the BLAST results
-        with open(xml_filename) as result_handle:
-            blast_records = NCBIXML.parse(result_handle)
-            blast_records = list(blast_records)  # Convert generator to list
+        # Stream-parse the results straight from the handle; no write/reread
+        # round-trip through an XML file on disk
+        blast_records = await asyncio.to_thread(
+            lambda: list(NCBIXML.parse(result_handle))
+        )
 
         # Extract relevant information
-        results = []
-        for blast_record in blast_records:
-            record_info = {
+        results = [
+            {
                 "query": blast_record.query,
-                "alignments": []
-            }
-            for alignment in blast_record.alignments:
-                for hsp in alignment.hsps:
-                    alignment_info = {
+                "alignments": [
+                    {
                         "match": alignment.title,
                         "score": hsp.score,
                         "e_value": getattr(hsp, 'evalue', hsp.expect),
@@ -611,8 +796,13 @@ async def run_swissprot_blast(
                         "alignment_length": hsp.align_length,
                         "percent_identity": (hsp.identities / hsp.align_length) * 100
                     }
-                    record_info["alignments"].append(alignment_info)
-            results.append(record_info)
+                    for alignment in blast_record.alignments
+                    for hsp in alignment.hsps
+                ]
+            }
+            for blast_record in blast_records
+        ]
+        result_handle.close()
 
         return {
             "message": "SwissProt BLAST search completed.",
@@ -676,4 +866,7 @@ async def health_check():
 # =======================
 
 # To run the server, use the command:
-# uvicorn main:app --host 0.0.0.0 --port 8000
+# uvicorn main:app --host 0.0.0.0 --port 8000 --loop uvloop --http httptools --workers $(nproc)
+#
+# uvloop and httptools replace the default asyncio loop and HTTP parser
+# with C implementations; each worker keeps its own in-process caches.